@@ -6,15 +6,27 @@ This script creates test scenarios and evaluates solutions for finding duplicate
 based on content hash (not just filename).
 """
 
+import argparse
 import hashlib
 import os
 import tempfile
 import shutil
+import time
 from pathlib import Path
-from typing import Dict, List, Set, Callable, Any
+from typing import Dict, List, Set, Tuple, Callable, Any
 import sys
 
 
+# Names a solution module may use for its entry point, in order of preference
+SOLUTION_FUNCTION_NAMES = [
+    'find_duplicates',
+    'find_duplicate_files',
+    'get_duplicates',
+    'duplicate_finder',
+    'main'
+]
+
+
 def create_test_filesystem() -> Path:
     """Create a temporary filesystem with known duplicate files for testing."""
     test_dir = Path(tempfile.mkdtemp(prefix="duplicate_test_"))
@@ -209,7 +221,6 @@ def run_evaluation(solution_func: Callable) -> Dict[str, Any]:
         
         # Performance test (basic)
         print("Testing performance...")
-        import time
         start_time = time.time()
         try:
             solution_func(str(test_dir))
@@ -277,30 +288,871 @@ def print_results(results: Dict[str, Any]) -> None:
     print(f"\nOVERALL: {'✅ PASSED' if results['overall_passed'] else '❌ FAILED'}")
 
 
+def benchmark_hash_algorithms(solution_module: Any, size_mb: int = 64) -> Dict[str, Any]:
+    """
+    Measure hashing throughput of every backend in solution_module.HASH_ALGORITHMS.
+
+    A single random file of size_mb megabytes is hashed once to warm the page
+    cache, then once per algorithm, so the numbers reflect hashing CPU rather
+    than disk speed.
+    """
+    algorithms = getattr(solution_module, "HASH_ALGORITHMS", None)
+    if not algorithms:
+        return {"error": "solution module does not expose HASH_ALGORITHMS"}
+
+    bench_dir = Path(tempfile.mkdtemp(prefix="hash_bench_"))
+    try:
+        bench_file = bench_dir / "payload.bin"
+        with open(bench_file, "wb") as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1 << 20))
+        solution_module.hash_file(str(bench_file), "crc32")
+
+        results = {}
+        for name in algorithms:
+            start_time = time.perf_counter()
+            solution_module.hash_file(str(bench_file), name)
+            elapsed = time.perf_counter() - start_time
+            results[name] = {
+                "seconds": elapsed,
+                "mb_per_sec": size_mb / elapsed if elapsed > 0 else float('inf'),
+            }
+        return {"size_mb": size_mb, "algorithms": results}
+    finally:
+        shutil.rmtree(bench_dir)
+
+
+def benchmark_lockstep(solution_module: Any, size_mb: int = 64) -> Dict[str, Any]:
+    """
+    Compare full hashing against lockstep comparison on a pair of large files.
+
+    Three same-size pairs are timed: one differing just past the prefilter
+    prefix (early), one differing in the last byte (late) and one identical.
+    Each pair sits in its own directory so the runs are independent.
+    """
+    bench_dir = Path(tempfile.mkdtemp(prefix="lockstep_bench_"))
+    try:
+        size = size_mb << 20
+        payload = os.urandom(1 << 20) * size_mb
+        scenarios = {
+            "differ_early": 8192,
+            "differ_late": size - 1,
+            "identical": None,
+        }
+        for scenario, diff_offset in scenarios.items():
+            (bench_dir / scenario).mkdir()
+            (bench_dir / scenario / "a.bin").write_bytes(payload)
+            other = bytearray(payload)
+            if diff_offset is not None:
+                other[diff_offset] ^= 0xFF
+            (bench_dir / scenario / "b.bin").write_bytes(bytes(other))
+
+        modes = {"hash": {"lockstep_max": 0}, "lockstep": {"lockstep_max": 2}}
+        results: Dict[str, Dict[str, float]] = {}
+        for scenario in scenarios:
+            results[scenario] = {}
+            for mode, options in modes.items():
+                start_time = time.perf_counter()
+                solution_module.find_duplicates(str(bench_dir / scenario), **options)
+                results[scenario][mode] = time.perf_counter() - start_time
+        return {"size_mb": size_mb, "scenarios": results}
+    finally:
+        shutil.rmtree(bench_dir)
+
+
+def benchmark_multi_root(
+    solution_module: Any, roots: int = 4, files_per_root: int = 40, size_kb: int = 2048
+) -> Dict[str, Any]:
+    """
+    Compare a serial scan with a per-lane parallel scan over several roots.
+
+    Local directories stand in for separate disks: the parallel run uses
+    lane_by="root" so each directory gets its own I/O lane. Every file has a
+    same-size twin in the next root, half of them identical, so all work is
+    cross-root and every candidate must be read.
+    """
+    bench_dir = Path(tempfile.mkdtemp(prefix="multi_root_bench_"))
+    try:
+        size = size_kb << 10
+        root_dirs = [bench_dir / f"disk{r}" for r in range(roots)]
+        for root_dir in root_dirs:
+            root_dir.mkdir()
+        for r, root_dir in enumerate(root_dirs):
+            for i in range(files_per_root):
+                # Sizes are unique per (root pair, file) so groups stay pairs
+                payload = os.urandom(size + r * files_per_root + i)
+                (root_dir / f"f{i}.bin").write_bytes(payload)
+                twin = bytearray(payload)
+                if i % 2:
+                    twin[-1] ^= 0xFF
+                next_dir = root_dirs[(r + 1) % roots]
+                (next_dir / f"twin_of_{r}_{i}.bin").write_bytes(bytes(twin))
+
+        paths = [str(root_dir) for root_dir in root_dirs]
+        modes = {
+            "serial": {"parallel": False},
+            "parallel": {"parallel": True, "lane_by": "root"},
+        }
+        results: Dict[str, Any] = {}
+        for mode, options in modes.items():
+            start_time = time.perf_counter()
+            found = solution_module.find_duplicates(paths, **options)
+            results[mode] = {
+                "seconds": time.perf_counter() - start_time,
+                "groups": len(found),
+            }
+        return {
+            "roots": roots,
+            "total_mb": roots * files_per_root * 2 * size_kb / 1024,
+            "modes": results,
+        }
+    finally:
+        shutil.rmtree(bench_dir)
+
+
+def evict_from_page_cache(directory: Path) -> bool:
+    """
+    Best-effort cold cache: flush dirty pages, then DONTNEED every file.
+
+    Returns False where posix_fadvise is unavailable, in which case runs
+    are effectively warm-cache.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    os.sync()
+    for file_path in directory.rglob("*"):
+        if file_path.is_file() and not file_path.is_symlink():
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+    return True
+
+
+def benchmark_read_order(
+    solution_module: Any, groups: int = 60, group_size: int = 6, size_kb: int = 512
+) -> Dict[str, Any]:
+    """
+    Time a cold-cache scan under each read-order policy, with and without fadvise.
+
+    Files are created in a shuffled order and spread across directories, so
+    walk order, inode order and on-disk order all differ. Each group shares
+    one size; half of every group is identical so groups are hashed in full.
+    """
+    import random
+
+    bench_dir = Path(tempfile.mkdtemp(prefix="read_order_bench_"))
+    try:
+        rng = random.Random(0)
+        size = size_kb << 10
+        jobs = []
+        for g in range(groups):
+            common = os.urandom(size + g)
+            for member in range(group_size):
+                jobs.append((g, member, common))
+        rng.shuffle(jobs)
+        for g, member, common in jobs:
+            subdir = bench_dir / f"d{rng.randrange(16)}"
+            subdir.mkdir(exist_ok=True)
+            payload = common if member % 2 else os.urandom(len(common))
+            (subdir / f"g{g}_m{member}.bin").write_bytes(payload)
+
+        results: Dict[str, Dict[str, float]] = {}
+        cold = True
+        for read_order in getattr(solution_module, "READ_ORDERS", ("none",)):
+            results[read_order] = {}
+            for fadvise in (False, True):
+                cold = evict_from_page_cache(bench_dir) and cold
+                start_time = time.perf_counter()
+                solution_module.find_duplicates(
+                    str(bench_dir), read_order=read_order, fadvise=fadvise,
+                    parallel=False, lockstep_max=0,
+                )
+                label = "fadvise" if fadvise else "plain"
+                results[read_order][label] = time.perf_counter() - start_time
+        return {
+            "files": groups * group_size,
+            "total_mb": groups * group_size * size_kb / 1024,
+            "cold_cache": cold,
+            "policies": results,
+        }
+    finally:
+        shutil.rmtree(bench_dir)
+
+
+# Benchmark tree profiles. "large" reaches 10^6 files and multi-GB sparse files;
+# expect it to take a long time to generate.
+BENCHMARK_PROFILES: Dict[str, Dict[str, Any]] = {
+    "small": {
+        "file_count": 2_000,
+        "size_distribution": "mixed",
+        "max_size": 1 << 20,
+        "duplicate_ratio": 0.3,
+        "adversarial_groups": 20,
+        "adversarial_group_size": 4,
+        "adversarial_size": 256 << 10,
+        "sparse_files": 2,
+        "sparse_size": 64 << 20,
+        "depth": 4,
+        "fanout": 4,
+    },
+    "medium": {
+        "file_count": 50_000,
+        "size_distribution": "mixed",
+        "max_size": 4 << 20,
+        "duplicate_ratio": 0.2,
+        "adversarial_groups": 100,
+        "adversarial_group_size": 4,
+        "adversarial_size": 1 << 20,
+        "sparse_files": 4,
+        "sparse_size": 512 << 20,
+        "depth": 6,
+        "fanout": 8,
+    },
+    "large": {
+        "file_count": 1_000_000,
+        "size_distribution": "tiny",
+        "max_size": 4096,
+        "duplicate_ratio": 0.1,
+        "adversarial_groups": 500,
+        "adversarial_group_size": 4,
+        "adversarial_size": 4 << 20,
+        "sparse_files": 4,
+        "sparse_size": 4 << 30,
+        "depth": 8,
+        "fanout": 10,
+    },
+}
+
+
+def _benchmark_payload(content_id: int, size: int) -> bytes:
+    """Deterministic content, unique per content_id for any size >= 8."""
+    import random
+
+    tag = content_id.to_bytes(8, "little")
+    return tag + random.Random(content_id).randbytes(max(0, size - len(tag)))
+
+
+def create_benchmark_filesystem(
+    root: Path,
+    file_count: int = 2_000,
+    size_distribution: str = "mixed",
+    max_size: int = 1 << 20,
+    duplicate_ratio: float = 0.3,
+    adversarial_groups: int = 20,
+    adversarial_group_size: int = 4,
+    adversarial_size: int = 256 << 10,
+    sparse_files: int = 2,
+    sparse_size: int = 64 << 20,
+    depth: int = 4,
+    fanout: int = 4,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Generate a synthetic tree for benchmarking and return its manifest.
+
+    Args:
+        root: Existing empty directory to fill
+        file_count: Number of regular (non-adversarial, non-sparse) files
+        size_distribution: "tiny" (8 B to max_size, uniform) or "mixed"
+            (log-uniform between 8 B and max_size: mostly small, some large)
+        max_size: Upper bound for regular file sizes
+        duplicate_ratio: Fraction of regular files that copy an earlier file
+        adversarial_groups: Groups of same-size files sharing everything but
+            their last 8 bytes, so size and prefix filters cannot prune them
+        adversarial_group_size: Files per adversarial group
+        adversarial_size: Size of adversarial files
+        sparse_files: Number of sparse files; they come in identical pairs
+        sparse_size: Apparent size of each sparse file
+        depth: Maximum directory nesting depth
+        fanout: Subdirectories per directory level
+        seed: Seed for sizes, placement and duplicate choice
+
+    Returns:
+        Manifest with the parameters, total_bytes, the expected number of
+        duplicate groups and files in them, and the expected groups themselves
+        as sorted path lists under "expected_group_paths"
+    """
+    import random
+
+    rng = random.Random(seed)
+    next_id = 0
+    content_paths: Dict[int, List[str]] = {}
+    total_bytes = 0
+    made_dirs: Set[str] = set()
+
+    def place(name: str) -> str:
+        parts = [f"d{rng.randrange(fanout)}" for _ in range(rng.randint(0, depth))]
+        directory = os.path.join(str(root), *parts)
+        if directory not in made_dirs:
+            os.makedirs(directory, exist_ok=True)
+            made_dirs.add(directory)
+        return os.path.join(directory, name)
+
+    def write(name: str, payload: bytes) -> str:
+        path = place(name)
+        with open(path, "wb") as f:
+            f.write(payload)
+        return path
+
+    # Regular files: unique content, or a copy of an earlier unique file
+    originals: List[Tuple[int, int]] = []
+    for i in range(file_count):
+        if originals and rng.random() < duplicate_ratio:
+            content_id, size = rng.choice(originals)
+        else:
+            if size_distribution == "tiny":
+                size = rng.randint(8, max(8, max_size))
+            else:
+                size = int(8 * (max(8, max_size) / 8) ** rng.random())
+            content_id = next_id
+            next_id += 1
+            originals.append((content_id, size))
+        path = write(f"f{i}.bin", _benchmark_payload(content_id, size))
+        content_paths.setdefault(content_id, []).append(path)
+        total_bytes += size
+
+    # Adversarial groups: same size, same long prefix, different tail
+    for g in range(adversarial_groups):
+        shared = _benchmark_payload(next_id, adversarial_size - 8)
+        next_id += 1
+        for member in range(adversarial_group_size):
+            path = write(f"adv{g}_{member}.bin", shared + next_id.to_bytes(8, "little"))
+            content_paths[next_id] = [path]
+            next_id += 1
+            total_bytes += adversarial_size
+
+    # Sparse files in identical pairs: a tag at both ends, holes in between
+    for i in range(sparse_files):
+        if i % 2 == 0:
+            content_id = next_id
+            next_id += 1
+        tag = content_id.to_bytes(8, "little")
+        path = place(f"sparse{i}.img")
+        with open(path, "wb") as f:
+            f.write(tag)
+            f.truncate(sparse_size)
+            f.seek(sparse_size - len(tag))
+            f.write(tag)
+        content_paths.setdefault(content_id, []).append(path)
+        total_bytes += sparse_size
+
+    expected_groups = sorted(
+        sorted(paths) for paths in content_paths.values() if len(paths) > 1
+    )
+    return {
+        "files": file_count + adversarial_groups * adversarial_group_size + sparse_files,
+        "directories": len(made_dirs),
+        "total_bytes": total_bytes,
+        "expected_groups": len(expected_groups),
+        "expected_duplicate_files": sum(len(paths) for paths in expected_groups),
+        "expected_group_paths": expected_groups,
+        "parameters": {
+            "file_count": file_count,
+            "size_distribution": size_distribution,
+            "max_size": max_size,
+            "duplicate_ratio": duplicate_ratio,
+            "adversarial_groups": adversarial_groups,
+            "adversarial_group_size": adversarial_group_size,
+            "adversarial_size": adversarial_size,
+            "sparse_files": sparse_files,
+            "sparse_size": sparse_size,
+            "depth": depth,
+            "fanout": fanout,
+            "seed": seed,
+        },
+    }
+
+
+def _read_proc_io() -> Dict[str, int]:
+    """Read counters from /proc/self/io (Linux); empty where unavailable."""
+    try:
+        with open("/proc/self/io") as f:
+            return {
+                key: int(value)
+                for key, value in (line.split(": ") for line in f if ": " in line)
+            }
+    except OSError:
+        return {}
+
+
+def _measure_scan(
+    module_name: str,
+    func_name: str,
+    directory: str,
+    conn: Any,
+    options: Dict[str, Any],
+) -> None:
+    """Child-process body: run one scan and send back timing, I/O and memory figures."""
+    import importlib
+    import resource
+
+    try:
+        solution_func = getattr(importlib.import_module(module_name), func_name)
+        baseline_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        io_before = _read_proc_io()
+        start_time = time.perf_counter()
+        result = solution_func(directory, **options)
+        elapsed = time.perf_counter() - start_time
+        io_after = _read_proc_io()
+        peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        groups = normalize_result(result)
+        conn.send({
+            "seconds": elapsed,
+            "found_groups": len(groups),
+            "found_duplicate_files": sum(len(files) for files in groups.values()),
+            "groups": [sorted(map(str, files)) for files in groups.values()],
+            # rchar counts every byte returned by read(), cached or not;
+            # read_bytes only what the storage layer had to fetch
+            "bytes_read": (
+                io_after["rchar"] - io_before["rchar"] if "rchar" in io_after else None
+            ),
+            "storage_bytes_read": (
+                io_after["read_bytes"] - io_before["read_bytes"]
+                if "read_bytes" in io_after else None
+            ),
+            # ru_maxrss is KiB on Linux, bytes on macOS
+            "peak_rss_mb": peak_rss_kb / (1 << 20 if sys.platform == "darwin" else 1024),
+            "baseline_rss_mb": baseline_rss_kb / (
+                1 << 20 if sys.platform == "darwin" else 1024
+            ),
+        })
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_measured_scan(
+    solution_module: Any, directory: Path, **options: Any
+) -> Dict[str, Any]:
+    """
+    Run the solution in a fresh process so peak RSS and I/O counters are its own.
+
+    Keyword options are passed to the solution function, dropping any that its
+    signature doesn't accept.
+    """
+    import inspect
+    import multiprocessing
+
+    func_name = next(
+        (name for name in SOLUTION_FUNCTION_NAMES if hasattr(solution_module, name)),
+        None,
+    )
+    if func_name is None:
+        return {"error": "no solution function found"}
+    parameters = inspect.signature(getattr(solution_module, func_name)).parameters
+    options = {name: value for name, value in options.items() if name in parameters}
+
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_measure_scan,
+        args=(solution_module.__name__, func_name, str(directory), child_conn, options),
+    )
+    process.start()
+    child_conn.close()
+    try:
+        measurement = parent_conn.recv()
+    except EOFError:
+        measurement = {"error": f"scan process exited with code {process.exitcode}"}
+    process.join()
+    return measurement
+
+
+def benchmark_suite(solution_module: Any, profile: str = "small") -> Dict[str, Any]:
+    """
+    Generate a profile's benchmark tree and measure a cold- and a warm-cache scan.
+
+    Each run reports files/sec, MB/s (logical bytes in the tree), bytes read,
+    storage bytes read, peak RSS and whether the found groups are exactly the
+    manifest's path sets. A solution that drops pages after reading them
+    (fadvise=True) would turn a second pass cold again, so the warm pass and
+    an untimed warm-up scan before it run with fadvise=False where accepted.
+    """
+    bench_dir = Path(tempfile.mkdtemp(prefix=f"bench_{profile}_"))
+    try:
+        generate_start = time.perf_counter()
+        manifest = create_benchmark_filesystem(bench_dir, **BENCHMARK_PROFILES[profile])
+        generate_seconds = time.perf_counter() - generate_start
+        # Too large to report; kept only to check each run's groups against
+        expected = {
+            frozenset(paths) for paths in manifest.pop("expected_group_paths")
+        }
+
+        # Without posix_fadvise the "cold" run is really warm; the report says so
+        evicted = evict_from_page_cache(bench_dir)
+        runs: Dict[str, Any] = {}
+        for cache in ("cold", "warm"):
+            options: Dict[str, Any] = {}
+            if cache == "warm":
+                options["fadvise"] = False
+                run_measured_scan(solution_module, bench_dir, **options)
+            measurement = run_measured_scan(solution_module, bench_dir, **options)
+            if "error" not in measurement:
+                found = {frozenset(paths) for paths in measurement.pop("groups")}
+                seconds = measurement["seconds"]
+                measurement["files_per_sec"] = manifest["files"] / seconds
+                measurement["mb_per_sec"] = manifest["total_bytes"] / (1 << 20) / seconds
+                measurement["correct"] = found == expected
+            runs[cache] = measurement
+        runs["cold"]["cache_evicted"] = evicted
+
+        return {
+            "profile": profile,
+            "generate_seconds": generate_seconds,
+            "manifest": manifest,
+            "runs": runs,
+        }
+    finally:
+        shutil.rmtree(bench_dir)
+
+
+def benchmark_pipeline(solution_module: Any, profile: str = "small") -> Dict[str, Any]:
+    """
+    Compare a walk-then-hash scan with the overlapped walk/hash pipeline.
+
+    The walk alone is timed with a plain os.walk + stat, so the staged scan's
+    hashing time is roughly staged - walk. A well-overlapped pipeline lands
+    near max(walk, hash) rather than their sum. Every run starts cold.
+    """
+    bench_dir = Path(tempfile.mkdtemp(prefix="pipeline_bench_"))
+    try:
+        manifest = create_benchmark_filesystem(bench_dir, **BENCHMARK_PROFILES[profile])
+
+        evict_from_page_cache(bench_dir)
+        start_time = time.perf_counter()
+        for dirpath, _, filenames in os.walk(bench_dir):
+            for filename in filenames:
+                os.stat(os.path.join(dirpath, filename))
+        walk_seconds = time.perf_counter() - start_time
+
+        timings: Dict[str, float] = {}
+        for mode, pipeline in (("staged", False), ("pipelined", True)):
+            evict_from_page_cache(bench_dir)
+            start_time = time.perf_counter()
+            solution_module.find_duplicates(str(bench_dir), pipeline=pipeline)
+            timings[mode] = time.perf_counter() - start_time
+
+        hash_seconds = max(0.0, timings["staged"] - walk_seconds)
+        return {
+            "profile": profile,
+            "files": manifest["files"],
+            "walk_seconds": walk_seconds,
+            "hash_seconds": hash_seconds,
+            "ideal_seconds": max(walk_seconds, hash_seconds),
+            "modes": timings,
+        }
+    finally:
+        shutil.rmtree(bench_dir)
+
+
+def benchmark_memory(solution_module: Any, files: int = 50_000) -> Dict[str, Any]:
+    """
+    Measure bytes of Python heap per scanned file with tracemalloc.
+
+    Every file gets a distinct size (as sparse, empty-content files), so no
+    file becomes a duplicate candidate. The scan peak includes per-directory
+    and walk overhead besides the index; where the solution reports a
+    ScanStats, the index's own size (index_bytes) is reported separately.
+    As a point of reference, a naive Dict[int, List[str]] size map of full
+    path strings is measured on the same tree.
+    """
+    import random
+    import tracemalloc
+
+    bench_dir = Path(tempfile.mkdtemp(prefix="memory_bench_"))
+    try:
+        rng = random.Random(0)
+        for i in range(files):
+            parts = [f"dir{rng.randrange(6)}" for _ in range(rng.randint(1, 6))]
+            directory = bench_dir.joinpath(*parts)
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(directory / f"file_{i:07d}.dat", "wb") as f:
+                f.truncate(i * 4099 + 1)
+        manifest = {"files": files}
+
+        tracemalloc.start()
+        naive: Dict[int, List[str]] = {}
+        for dirpath, _, filenames in os.walk(bench_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                naive.setdefault(os.stat(path).st_size, []).append(path)
+        naive_bytes = tracemalloc.get_traced_memory()[1]
+        del naive
+        tracemalloc.stop()
+
+        options: Dict[str, Any] = {}
+        if hasattr(solution_module, "ScanStats"):
+            options["stats"] = solution_module.ScanStats()
+        tracemalloc.start()
+        solution_module.find_duplicates(str(bench_dir), parallel=False, **options)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        results = {
+            "files": manifest["files"],
+            "naive_size_map_peak_bytes_per_file": naive_bytes / manifest["files"],
+            "scan_peak_bytes_per_file": peak_bytes / manifest["files"],
+        }
+        if "stats" in options:
+            results["index_bytes_per_file"] = options["stats"].index_bytes / files
+        return results
+    finally:
+        shutil.rmtree(bench_dir)
+
+
+def benchmark_watch(solution_module: Any, profile: str = "small") -> Dict[str, Any]:
+    """
+    Time incremental DuplicateIndex updates against a full rescan.
+
+    The tree is mutated step by step: a duplicate is copied in, a member is
+    replaced, another is deleted, a directory is renamed, and a subtree with
+    a new pair is created, then deleted and recreated with a copy inside
+    (checking a recreated directory is watched again). After each step one
+    poll() is timed against a full find_duplicates, and the index's groups
+    are checked against it.
+    Runs once per available backend, on a warm cache.
+    """
+    bench_dir = Path(tempfile.mkdtemp(prefix="watch_bench_"))
+    try:
+        manifest = create_benchmark_filesystem(bench_dir, **BENCHMARK_PROFILES[profile])
+
+        def groups_of(result: Dict[str, List[str]]) -> Set[frozenset]:
+            return {frozenset(paths) for paths in result.values()}
+
+        backends: Dict[str, Any] = {}
+        for backend in ("poll", "inotify"):
+            try:
+                index = solution_module.DuplicateIndex(str(bench_dir), backend=backend)
+            except OSError as e:
+                backends[backend] = {"error": str(e)}
+                continue
+            with index:
+                start_time = time.perf_counter()
+                index.scan()
+                scan_seconds = time.perf_counter() - start_time
+
+                group = sorted(min(index.groups().values(), key=len))
+                first, second = Path(group[0]), Path(group[1])
+                subdirs = sorted(p for p in bench_dir.iterdir() if p.is_dir())
+                renamed = subdirs[0].with_name(subdirs[0].name + "_renamed")
+                fresh = bench_dir / f"new_{backend}" / "nested"
+
+                def add_copy() -> None:
+                    shutil.copyfile(first, bench_dir / f"copy_{backend}.bin")
+
+                def replace_member() -> None:
+                    temporary = second.with_name(second.name + ".tmp")
+                    temporary.write_bytes(b"replaced " + first.read_bytes())
+                    os.replace(temporary, second)
+
+                def delete_member() -> None:
+                    first.unlink()
+
+                def rename_directory() -> None:
+                    subdirs[0].rename(renamed)
+
+                def create_subtree() -> None:
+                    fresh.mkdir(parents=True)
+                    payload = f"pair for {backend}".encode() * 1000
+                    (fresh / "a.bin").write_bytes(payload)
+                    (fresh / "b.bin").write_bytes(payload)
+
+                def recreate_directory() -> None:
+                    # Delete and recreate a watched directory, let the index
+                    # see that, then check it still notices changes inside
+                    shutil.rmtree(fresh)
+                    fresh.mkdir()
+                    index.poll()
+                    shutil.copyfile(
+                        bench_dir / f"copy_{backend}.bin", fresh / "again.bin"
+                    )
+
+                steps: Dict[str, Any] = {}
+                for step, mutate in (
+                    ("add_copy", add_copy),
+                    ("replace_member", replace_member),
+                    ("delete_member", delete_member),
+                    ("rename_directory", rename_directory),
+                    ("create_subtree", create_subtree),
+                    ("recreate_directory", recreate_directory),
+                ):
+                    mutate()
+                    start_time = time.perf_counter()
+                    changes = index.poll()
+                    poll_seconds = time.perf_counter() - start_time
+
+                    start_time = time.perf_counter()
+                    expected = solution_module.find_duplicates(str(bench_dir))
+                    rescan_seconds = time.perf_counter() - start_time
+
+                    steps[step] = {
+                        "poll_seconds": poll_seconds,
+                        "rescan_seconds": rescan_seconds,
+                        "changes": sorted({change.kind for change in changes}),
+                        "correct": groups_of(index.groups()) == groups_of(expected),
+                    }
+                # Undo the rename so the next backend starts from the same layout
+                renamed.rename(subdirs[0])
+            backends[backend] = {"scan_seconds": scan_seconds, "steps": steps}
+
+        return {"profile": profile, "files": manifest["files"], "backends": backends}
+    finally:
+        shutil.rmtree(bench_dir)
+
+
+def print_benchmark(name: str, results: Dict[str, Any]) -> None:
+    """Print benchmark results in a readable format."""
+    print("\n" + "="*60)
+    print(f"BENCHMARK: {name}")
+    print("="*60)
+
+    if "error" in results:
+        print(f"  Error: {results['error']}")
+        return
+
+    if name == "hash":
+        print(f"  Payload: {results['size_mb']} MB (warm cache)")
+        for algorithm, timing in sorted(
+            results["algorithms"].items(), key=lambda item: -item[1]["mb_per_sec"]
+        ):
+            print(f"  {algorithm:<12} {timing['mb_per_sec']:>10.1f} MB/s"
+                  f"  ({timing['seconds']:.3f}s)")
+    elif name == "multi_root":
+        print(f"  {results['roots']} roots, {results['total_mb']:.0f} MB (warm cache)")
+        for mode, timing in results["modes"].items():
+            print(f"  {mode:<10} {timing['seconds']:.3f}s  ({timing['groups']} groups)")
+    elif name == "read_order":
+        cache = "cold cache" if results["cold_cache"] else "warm cache"
+        print(f"  {results['files']} files, {results['total_mb']:.0f} MB ({cache})")
+        for policy, timings in results["policies"].items():
+            print(f"  {policy:<8} plain {timings['plain']:.3f}s"
+                  f"  fadvise {timings['fadvise']:.3f}s")
+    elif name == "suite":
+        manifest = results["manifest"]
+        print(f"  Profile {results['profile']}: {manifest['files']} files in "
+              f"{manifest['directories']} dirs, "
+              f"{manifest['total_bytes'] / (1 << 20):.0f} MB, "
+              f"{manifest['expected_groups']} duplicate groups "
+              f"(generated in {results['generate_seconds']:.1f}s)")
+        for cache, run in results["runs"].items():
+            if "error" in run:
+                print(f"  {cache:<5} Error: {run['error']}")
+                continue
+            bytes_read = run["bytes_read"]
+            read_mb = f"{bytes_read / (1 << 20):.0f}" if bytes_read is not None else "?"
+            storage_read = run["storage_bytes_read"]
+            storage_mb = (
+                f"{storage_read / (1 << 20):.0f}" if storage_read is not None else "?"
+            )
+            print(f"  {cache:<5} {run['seconds']:.3f}s  {run['files_per_sec']:.0f} files/s"
+                  f"  {run['mb_per_sec']:.0f} MB/s  read {read_mb} MB"
+                  f" (storage {storage_mb} MB)"
+                  f"  peak RSS {run['peak_rss_mb']:.1f} MB"
+                  f"  {'correct' if run['correct'] else 'WRONG GROUPS'}")
+    elif name == "pipeline":
+        print(f"  Profile {results['profile']}: {results['files']} files (cold cache)")
+        print(f"  walk only  {results['walk_seconds']:.3f}s"
+              f"  hash (staged - walk) {results['hash_seconds']:.3f}s"
+              f"  ideal overlap {results['ideal_seconds']:.3f}s")
+        for mode, seconds in results["modes"].items():
+            print(f"  {mode:<10} {seconds:.3f}s")
+    elif name == "memory":
+        print(f"  {results['files']} files (tracemalloc)")
+        print(f"  naive size map peak  {results['naive_size_map_peak_bytes_per_file']:.0f} bytes/file")
+        print(f"  scan peak            {results['scan_peak_bytes_per_file']:.0f} bytes/file")
+        if "index_bytes_per_file" in results:
+            print(f"  index alone          {results['index_bytes_per_file']:.0f} bytes/file")
+    elif name == "watch":
+        print(f"  Profile {results['profile']}: {results['files']} files (warm cache)")
+        for backend, run in results["backends"].items():
+            if "error" in run:
+                print(f"  {backend:<8} Error: {run['error']}")
+                continue
+            print(f"  {backend:<8} initial scan {run['scan_seconds']:.3f}s")
+            for step, timing in run["steps"].items():
+                print(f"    {step:<19} poll {timing['poll_seconds'] * 1000:>8.1f} ms"
+                      f"  rescan {timing['rescan_seconds'] * 1000:>8.1f} ms"
+                      f"  {'/'.join(timing['changes']) or '-':<20}"
+                      f"  {'correct' if timing['correct'] else 'WRONG GROUPS'}")
+    elif name == "lockstep":
+        print(f"  Pair of {results['size_mb']} MB files (warm cache)")
+        for scenario, timings in results["scenarios"].items():
+            print(f"  {scenario:<14} hash {timings['hash']:.3f}s"
+                  f"  lockstep {timings['lockstep']:.3f}s")
+
+
+def write_benchmark_json(path: str, module_name: str, results: Dict[str, Any]) -> None:
+    """Write benchmark results with enough context to compare runs over time."""
+    import json
+    import platform
+    from datetime import datetime, timezone
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "solution_module": module_name,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "benchmarks": results,
+    }
+    text = json.dumps(report, indent=2, default=str)
+    if path == "-":
+        print(text)
+    else:
+        Path(path).write_text(text + "\n")
+
+
+BENCHMARKS = {
+    "hash": benchmark_hash_algorithms,
+    "lockstep": benchmark_lockstep,
+    "multi_root": benchmark_multi_root,
+    "read_order": benchmark_read_order,
+    "suite": benchmark_suite,
+    "pipeline": benchmark_pipeline,
+    "memory": benchmark_memory,
+    "watch": benchmark_watch,
+}
+
+
 def main():
     """Main entry point for the evaluation script."""
-    if len(sys.argv) < 2:
-        print("Usage: python evaluate.py <solution_module>")
-        print("Example: python evaluate.py solution")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Evaluate a duplicate file finder.",
+        epilog="Example: python evaluate.py solution --benchmark hash",
+    )
+    parser.add_argument("solution_module", help="Module name of the solution")
+    parser.add_argument(
+        "--benchmark",
+        choices=list(BENCHMARKS),
+        action="append",
+        default=[],
+        help="Run a benchmark after the evaluation (repeatable)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=list(BENCHMARK_PROFILES),
+        default="small",
+        help="Tree profile for --benchmark suite/pipeline/watch (default: small)",
+    )
+    parser.add_argument(
+        "--json",
+        metavar="PATH",
+        help="Also write benchmark results as JSON to PATH ('-' for stdout)",
+    )
+    args = parser.parse_args()
     
-    module_name = sys.argv[1]
+    module_name = args.solution_module
     
     try:
         # Import the solution module
         solution_module = __import__(module_name)
         
         # Look for a function that finds duplicates
-        possible_function_names = [
-            'find_duplicates',
-            'find_duplicate_files',
-            'get_duplicates',
-            'duplicate_finder',
-            'main'
-        ]
-        
         solution_func = None
-        for func_name in possible_function_names:
+        for func_name in SOLUTION_FUNCTION_NAMES:
             if hasattr(solution_module, func_name):
                 solution_func = getattr(solution_module, func_name)
                 print(f"Found solution function: {func_name}")
@@ -308,13 +1160,27 @@ def main():
         
         if solution_func is None:
             print(f"Could not find a solution function in {module_name}.py")
-            print(f"Expected one of: {', '.join(possible_function_names)}")
+            print(f"Expected one of: {', '.join(SOLUTION_FUNCTION_NAMES)}")
             sys.exit(1)
         
         # Run evaluation
         results = run_evaluation(solution_func)
         print_results(results)
         
+        benchmark_results = {}
+        for benchmark_name in args.benchmark:
+            options = (
+                {"profile": args.profile}
+                if benchmark_name in ("suite", "pipeline", "watch") else {}
+            )
+            benchmark_results[benchmark_name] = BENCHMARKS[benchmark_name](
+                solution_module, **options
+            )
+            print_benchmark(benchmark_name, benchmark_results[benchmark_name])
+        
+        if args.json:
+            write_benchmark_json(args.json, module_name, benchmark_results)
+        
         # Exit with appropriate code
         sys.exit(0 if results["overall_passed"] else 1)
         